@@ -11,6 +11,8 @@ import requests
 from urllib3.exceptions import InsecureRequestWarning
 import zipfile
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Disable SSL warnings
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
@@ -26,6 +28,12 @@ DOMAIN = "DEFAULT"
 PROJECT = "MyProject"
 RUN_ID = "12345"
 RESULT_ID = "67890"
+# Report.zip is extracted straight from memory; SAVE_REPORT_ZIP=1 also keeps it on disk
+SAVE_REPORT_ZIP = os.environ.get("SAVE_REPORT_ZIP", "0") == "1"
+
+# Shared session so auth, endpoint probes and download reuse one keep-alive TLS connection
+SESSION = requests.Session()
+SESSION.verify = False
 
 def print_section(title):
     print("\n" + "=" * 60)
@@ -52,7 +60,7 @@ def authenticate():
     print(f"  URL: {url}")
     
     try:
-        response = requests.post(url, json=payload, headers=headers, verify=False)
+        response = SESSION.post(url, json=payload, headers=headers)
         
         print(f"  Status Code: {response.status_code}")
         
@@ -97,25 +105,35 @@ def test_endpoints(cookie):
         "Accept": "application/octet-stream"
     }
     
-    for endpoint in endpoints:
-        url = f"https://{PC_HOST}:{PC_PORT}{endpoint}"
-        print(f"Testing: {endpoint}")
-        
-        try:
-            response = requests.head(url, headers=headers, verify=False, timeout=10)
+    # Probe all endpoints at once; results are still checked in list order
+    executor = ThreadPoolExecutor(max_workers=len(endpoints))
+    futures = [
+        executor.submit(SESSION.head, f"https://{PC_HOST}:{PC_PORT}{endpoint}", headers=headers, timeout=10)
+        for endpoint in endpoints
+    ]
+    
+    try:
+        for endpoint, future in zip(endpoints, futures):
+            print(f"Testing: {endpoint}")
             
-            if response.status_code == 200:
-                print(f"  ✓ 200 OK - Endpoint is accessible!")
-                return endpoint
-            elif response.status_code == 404:
-                print(f"  ✗ 404 Not Found")
-            elif response.status_code == 401:
-                print(f"  ✗ 401 Unauthorized")
-            else:
-                print(f"  ? Status: {response.status_code}")
+            try:
+                response = future.result()
                 
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
+                if response.status_code == 200:
+                    print(f"  ✓ 200 OK - Endpoint is accessible!")
+                    return endpoint
+                elif response.status_code == 404:
+                    print(f"  ✗ 404 Not Found")
+                elif response.status_code == 401:
+                    print(f"  ✗ 401 Unauthorized")
+                else:
+                    print(f"  ? Status: {response.status_code}")
+                    
+            except Exception as e:
+                print(f"  ✗ Error: {e}")
+    finally:
+        # Don't wait on slower probes once a working endpoint is known
+        executor.shutdown(wait=False, cancel_futures=True)
     
     print("\n✗ No working endpoint found!")
     print("\nTried all endpoints:")
@@ -124,6 +142,30 @@ def test_endpoints(cookie):
     print("\nPlease verify your configuration values.")
     sys.exit(1)
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+def open_report_file():
+    """Single handle the download streams into and extraction reads back from directly"""
+    filename = "Report.zip" if SAVE_REPORT_ZIP else None
+    if filename:
+        return filename, open(filename, 'w+b')
+    return filename, tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024)
+
+def stream_to_file(response, report_file):
+    """Copy the response body into report_file; each chunk's disk write overlaps reading the next chunk"""
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        pending_write = None
+        try:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                # Writes stay in order: wait for the previous one before queueing this chunk
+                if pending_write:
+                    pending_write.result()
+                pending_write = writer.submit(report_file.write, chunk)
+        finally:
+            # Also on a failed read: the last queued write finishes before the file is used or closed
+            if pending_write:
+                pending_write.result()
+
 def download_report(cookie, endpoint):
     """Download the report using the working endpoint"""
     print_section("STEP 3: Downloading Report")
@@ -140,7 +182,8 @@ def download_report(cookie, endpoint):
     print("Starting download...")
     
     try:
-        response = requests.get(url, headers=headers, verify=False, stream=True)
+        # Same keep-alive SESSION as authentication and the endpoint probes: no new TLS handshake
+        response = SESSION.get(url, headers=headers, stream=True)
         
         print(f"  Status Code: {response.status_code}")
         print(f"  Content-Type: {response.headers.get('content-type', 'unknown')}")
@@ -150,41 +193,47 @@ def download_report(cookie, endpoint):
             print(f"Response: {response.text[:500]}")
             sys.exit(1)
         
-        # Save to file
-        filename = "Report.zip"
-        with open(filename, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        filename, report_file = open_report_file()
+        stream_to_file(response, report_file)
         
-        file_size = os.path.getsize(filename)
+        file_size = report_file.tell()
+        report_file.seek(0)
         print(f"✓ Download complete!")
         print(f"  File size: {file_size:,} bytes")
         
-        return filename, file_size
+        return filename, report_file, file_size
         
     except Exception as e:
         print(f"✗ Error during download: {e}")
         sys.exit(1)
 
-def verify_and_extract(filename, file_size):
-    """Verify the downloaded file and extract if it's a valid zip"""
+MAIN_REPORT_NAMES = ('index.html', 'report.html', 'Report.html')
+
+def main_report_rank(path):
+    """Position of the first MAIN_REPORT_NAMES entry the path ends with (unmatched files rank last)"""
+    for rank, name in enumerate(MAIN_REPORT_NAMES):
+        if path.endswith(name):
+            return rank
+    return len(MAIN_REPORT_NAMES)
+
+def verify_and_extract(filename, report_file, file_size):
+    """Verify the downloaded report and extract if it's a valid zip"""
     print_section("STEP 4: Verify and Extract")
     
-    print(f"File: {filename}")
+    print(f"File: {filename or '(in memory)'}")
     print(f"Size: {file_size:,} bytes\n")
     
     if file_size < 100:
         print("⚠ File is very small (probably an error response)")
-        with open(filename, 'r') as f:
-            print(f"Content:\n{f.read()}")
+        print(f"Content:\n{report_file.read().decode(errors='replace')}")
         sys.exit(1)
     
     # Check if it's a valid ZIP
-    if not zipfile.is_zipfile(filename):
+    if not zipfile.is_zipfile(report_file):
         print("⚠ File is not a valid ZIP archive")
         print("First 500 bytes:")
-        with open(filename, 'rb') as f:
-            print(f.read(500))
+        report_file.seek(0)
+        print(report_file.read(500))
         sys.exit(1)
     
     print("✓ File is a valid ZIP archive!\n")
@@ -193,41 +242,27 @@ def verify_and_extract(filename, file_size):
     extract_dir = "extracted_report"
     print(f"Extracting to: {extract_dir}/")
     
-    with zipfile.ZipFile(filename, 'r') as zip_ref:
+    with zipfile.ZipFile(report_file, 'r') as zip_ref:
+        infos = [info for info in zip_ref.infolist() if not info.is_dir()]
         zip_ref.extractall(extract_dir)
     
     print("✓ Extraction complete\n")
     
-    # List extracted files
+    # List extracted files from the archive index (no stat calls), collecting HTML files in the same pass
     print("Extracted files:")
-    for root, dirs, files in os.walk(extract_dir):
-        for file in files:
-            filepath = os.path.join(root, file)
-            size = os.path.getsize(filepath)
-            print(f"  {filepath} ({size:,} bytes)")
-    
-    # Find HTML files
-    print("\nHTML files:")
     html_files = []
-    for root, dirs, files in os.walk(extract_dir):
-        for file in files:
-            if file.endswith(('.html', '.htm')):
-                filepath = os.path.join(root, file)
-                html_files.append(filepath)
-                print(f"  {filepath}")
+    for info in infos:
+        filepath = os.path.join(extract_dir, info.filename)
+        print(f"  {filepath} ({info.file_size:,} bytes)")
+        if filepath.endswith(('.html', '.htm')):
+            html_files.append(filepath)
     
-    # Find main report
-    main_report = None
-    for name in ['index.html', 'report.html', 'Report.html']:
-        for html_file in html_files:
-            if html_file.endswith(name):
-                main_report = html_file
-                break
-        if main_report:
-            break
+    print("\nHTML files:")
+    for filepath in html_files:
+        print(f"  {filepath}")
     
-    if not main_report and html_files:
-        main_report = html_files[0]
+    # Find main report: earliest name in MAIN_REPORT_NAMES wins, then archive order
+    main_report = min(html_files, key=main_report_rank, default=None)
     
     if main_report:
         print(f"\n✓ Main report: {main_report}")
@@ -258,10 +293,11 @@ def main():
     working_endpoint = test_endpoints(cookie)
     
     # Step 3: Download report
-    filename, file_size = download_report(cookie, working_endpoint)
+    filename, report_file, file_size = download_report(cookie, working_endpoint)
     
     # Step 4: Verify and extract
-    verify_and_extract(filename, file_size)
+    with report_file:
+        verify_and_extract(filename, report_file, file_size)
     
     # Summary
     print_section("SUMMARY")
@@ -271,7 +307,8 @@ def main():
     print(f"✓ Report downloaded: {file_size:,} bytes")
     print("✓ Report extracted successfully")
     print("\nFiles created:")
-    print("  - Report.zip (original download)")
+    if filename:
+        print(f"  - {filename} (original download)")
     print("  - extracted_report/ (extracted contents)")
     print("\n" + "=" * 60)
     print("TEST COMPLETED SUCCESSFULLY!")
@@ -4,10 +4,14 @@ Test script to discover and test AppDynamics metrics collection
 """
 import argparse
 import json
-from fetchers.appdynamics_fetcher import AppDynamicsDataFetcher
-from utils.logger import setup_logger
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 def main():
+    # Heavy imports (requests/urllib3) are deferred so importing this module stays cheap
+    from fetchers.appdynamics_fetcher import AppDynamicsDataFetcher
+    from utils.logger import setup_logger
+    
     parser = argparse.ArgumentParser(description='Test AppDynamics Metrics Collection')
     parser.add_argument('--controller', required=True, help='Controller URL')
     parser.add_argument('--account', required=True, help='Account name')
@@ -103,9 +107,11 @@ def test_single_config(fetcher, args, logger):
             logger.info(f"  Available applications: {', '.join(app_names)}")
             return 1
     
+    # Only once the app is known: its tiers and the tier's nodes in one parallel batch
+    tiers, nodes = _prefetch_tier_nodes(fetcher, app_name, tier_name)
+    
     # Verify tier exists
     logger.info("\n→ Verifying tier exists...")
-    tiers = fetcher.get_tiers_for_application(app_name)
     if tiers:
         tier_names = [tier.get('name') for tier in tiers]
         if tier_name in tier_names:
@@ -117,7 +123,6 @@ def test_single_config(fetcher, args, logger):
     
     # Verify node exists
     logger.info("\n→ Verifying node exists...")
-    nodes = fetcher.get_nodes_for_tier(app_name, tier_name)
     if nodes:
         node_names = [node.get('name') for node in nodes]
         if node_name in node_names:
@@ -260,6 +265,13 @@ def test_single_config(fetcher, args, logger):
     
     return 0
 
+def _prefetch_tier_nodes(fetcher, app_name, tier_name):
+    """Fetch tiers and nodes for one (already verified) app/tier concurrently"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        tiers_future = executor.submit(fetcher.get_tiers_for_application, app_name)
+        nodes_future = executor.submit(fetcher.get_nodes_for_tier, app_name, tier_name)
+        return tiers_future.result(), nodes_future.result()
+
 def discover_tier_nodes(fetcher, app_name, tier_name, logger):
     """Discover nodes for a specific tier"""
     
@@ -301,6 +313,9 @@ def discover_app_tiers(fetcher, app_name, output_file, logger):
     logger.info(f"DISCOVERING APPLICATION: {app_name}")
     logger.info("=" * 80)
     
+    get_nodes = fetcher.get_nodes_for_tier
+    log_info = logger.info
+    
     # Get tiers
     tiers = fetcher.get_tiers_for_application(app_name)
     if not tiers:
@@ -318,20 +333,20 @@ def discover_app_tiers(fetcher, app_name, output_file, logger):
         tier_name = tier.get('name')
         tier_type = tier.get('type', 'Unknown')
         
-        logger.info(f"\n[Tier {tier_idx}] {tier_name} ({tier_type})")
+        log_info(f"\n[Tier {tier_idx}] {tier_name} ({tier_type})")
         
         # Get nodes for tier
-        nodes = fetcher.get_nodes_for_tier(app_name, tier_name)
+        nodes = get_nodes(app_name, tier_name)
         node_names = []
         
         if nodes:
-            logger.info(f"  Nodes: {len(nodes)}")
+            log_info(f"  Nodes: {len(nodes)}")
             for node in nodes:
                 node_name = node.get('name')
                 node_names.append(node_name)
-                logger.info(f"    - {node_name}")
+                log_info(f"    - {node_name}")
         else:
-            logger.info(f"  No nodes found")
+            log_info(f"  No nodes found")
         
         app_config['tiers'].append({
             'tier_name': tier_name,
@@ -365,6 +380,10 @@ def discover_all_apps(fetcher, output_file, logger):
     logger.info("DISCOVERING ALL APPLICATIONS")
     logger.info("=" * 80)
     
+    get_tiers = fetcher.get_tiers_for_application
+    get_nodes = fetcher.get_nodes_for_tier
+    log_info = logger.info
+    
     # Get all applications
     apps = fetcher.get_applications()
     if not apps:
@@ -380,12 +399,12 @@ def discover_all_apps(fetcher, output_file, logger):
     
     for app_idx, app in enumerate(apps, 1):
         app_name = app.get('name')
-        logger.info(f"\n{'=' * 80}")
-        logger.info(f"[Application {app_idx}/{len(apps)}] {app_name}")
-        logger.info(f"{'=' * 80}")
+        log_info(f"\n{'=' * 80}")
+        log_info(f"[Application {app_idx}/{len(apps)}] {app_name}")
+        log_info(f"{'=' * 80}")
         
         # Get tiers
-        tiers = fetcher.get_tiers_for_application(app_name)
+        tiers = get_tiers(app_name)
         if not tiers:
             logger.warning(f"  No tiers found")
             continue
@@ -397,19 +416,19 @@ def discover_all_apps(fetcher, output_file, logger):
         
         for tier_idx, tier in enumerate(tiers, 1):
             tier_name = tier.get('name')
-            logger.info(f"\n  [Tier {tier_idx}/{len(tiers)}] {tier_name}")
+            log_info(f"\n  [Tier {tier_idx}/{len(tiers)}] {tier_name}")
             
             # Get nodes
-            nodes = fetcher.get_nodes_for_tier(app_name, tier_name)
+            nodes = get_nodes(app_name, tier_name)
             node_names = []
             
             if nodes:
                 node_names = [node.get('name') for node in nodes]
-                logger.info(f"    Nodes: {len(node_names)}")
+                log_info(f"    Nodes: {len(node_names)}")
                 for node_name in node_names:
-                    logger.info(f"      - {node_name}")
+                    log_info(f"      - {node_name}")
             else:
-                logger.info(f"    No nodes found")
+                log_info(f"    No nodes found")
             
             app_config['tiers'].append({
                 'tier_name': tier_name,
@@ -443,4 +462,4 @@ def discover_all_apps(fetcher, output_file, logger):
     return 0
 
 if __name__ == '__main__':
-    exit(main())
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
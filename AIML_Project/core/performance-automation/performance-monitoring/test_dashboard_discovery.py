@@ -4,10 +4,17 @@ Test script to discover and test AppDynamics metrics collection
 Enhanced with metric path discovery
 """
 import argparse
+import asyncio
 import json
 from fetchers.appdynamics_fetcher import AppDynamicsDataFetcher
 from utils.logger import setup_logger
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 def main():
     parser = argparse.ArgumentParser(description='Test AppDynamics Metrics Collection')
     parser.add_argument('--controller', required=True, help='Controller URL')
@@ -27,6 +34,8 @@ def main():
     parser.add_argument('--discover-tier', help='Discover nodes for specific tier (requires --app-name)')
     parser.add_argument('--discover-metrics', action='store_true',
                        help='Discover available metric paths (requires --app-name)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                       help='Use aiohttp for concurrent metric path discovery')
     
     # Output
     parser.add_argument('--output', help='Output JSON file path')
@@ -34,10 +43,12 @@ def main():
                        help='Test actual metrics collection')
     parser.add_argument('--duration', type=int, default=15,
                        help='Duration in minutes for metric collection (default: 15)')
+    parser.add_argument('--debug', action='store_true',
+                       help='Enable debug logging (e.g. response Content-Encoding)')
     
     args = parser.parse_args()
     
-    logger = setup_logger('AppDTest')
+    logger = setup_logger('AppDTest', level='DEBUG' if args.debug else 'INFO')
     
     # Initialize fetcher
     logger.info("Initializing AppDynamics connection...")
@@ -56,7 +67,7 @@ def main():
     # Mode 1: Discover available metrics
     if args.discover_metrics and args.app_name:
         return discover_available_metrics(fetcher, args.app_name, args.tier_name, 
-                                         args.node_name, logger)
+                                         args.node_name, logger, use_async=args.use_async)
     
     # Mode 2: Test single app/tier/node
     elif args.app_name and args.tier_name and args.node_name:
@@ -83,7 +94,8 @@ def main():
         logger.error("  5. Discover all: --discover-all")
         return 1
 
-def discover_available_metrics(fetcher, app_name, tier_name=None, node_name=None, logger=None):
+def discover_available_metrics(fetcher, app_name, tier_name=None, node_name=None, logger=None,
+                               use_async=False):
     """Discover what metrics are actually available"""
     
     logger.info("\n" + "=" * 80)
@@ -122,13 +134,27 @@ def discover_available_metrics(fetcher, app_name, tier_name=None, node_name=None
     
     all_discovered = {}
     
-    for base_path in metric_browser_paths:
-        logger.info(f"\n→ Exploring: {base_path}")
+    if use_async and not AIOHTTP_AVAILABLE:
+        logger.warning("aiohttp not installed → falling back to sequential discovery")
+        use_async = False
+    
+    if use_async:
+        for base_path in metric_browser_paths:
+            logger.info(f"\n→ Exploring: {base_path}")
         
-        discovered = discover_metrics_recursive(fetcher, app_name, base_path, logger, depth=0, max_depth=3)
-        if discovered:
-            all_discovered[base_path] = discovered
-            logger.info(f"  ✓ Found {len(discovered)} metric paths")
+        results = asyncio.run(discover_paths_async(fetcher, app_name, metric_browser_paths, logger, max_depth=3))
+        for base_path, discovered in results.items():
+            if discovered:
+                all_discovered[base_path] = discovered
+                logger.info(f"  ✓ Found {len(discovered)} metric paths under {base_path}")
+    else:
+        for base_path in metric_browser_paths:
+            logger.info(f"\n→ Exploring: {base_path}")
+            
+            discovered = discover_metrics_recursive(fetcher, app_name, base_path, logger, depth=0, max_depth=3)
+            if discovered:
+                all_discovered[base_path] = discovered
+                logger.info(f"  ✓ Found {len(discovered)} metric paths")
     
     # Display summary
     logger.info("\n" + "=" * 80)
@@ -164,6 +190,8 @@ def discover_metrics_recursive(fetcher, app_name, metric_path, logger, depth=0,
     try:
         response = fetcher.session.get(url, params=params, verify=False, timeout=30)
         response.raise_for_status()
+        if depth == 0:   # once per base path, not for every folder below it
+            logger.debug(f"Content-Encoding for {metric_path}: {response.headers.get('Content-Encoding', 'identity')}")
         
         metrics = response.json()
         discovered = []
@@ -190,6 +218,72 @@ def discover_metrics_recursive(fetcher, app_name, metric_path, logger, depth=0,
         logger.debug(f"Error discovering metrics at {metric_path}: {e}")
         return []
 
+async def discover_paths_async(fetcher, app_name, base_paths, logger, max_depth=3):
+    """Discover metrics under several base paths over one aiohttp session"""
+    
+    url = f"{fetcher.controller_url}/controller/rest/applications/{app_name}/metrics"
+    
+    connector = aiohttp.TCPConnector(limit_per_host=20, ssl=False)
+    async with aiohttp.ClientSession(
+        auth=aiohttp.BasicAuth(*fetcher.auth),
+        headers=fetcher.headers,
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=30)
+    ) as session:
+        results = await asyncio.gather(*(
+            discover_metrics_async(session, url, base_path, logger, depth=0, max_depth=max_depth)
+            for base_path in base_paths
+        ))
+    
+    return dict(zip(base_paths, results))
+
+async def discover_metrics_async(session, url, metric_path, logger, depth=0, max_depth=3):
+    """Async counterpart of discover_metrics_recursive; sibling folders are fetched concurrently"""
+    
+    if depth > max_depth:
+        return []
+    
+    params = {
+        'metric-path': metric_path,
+        'output': 'JSON'
+    }
+    
+    try:
+        async with session.get(url, params=params) as response:
+            response.raise_for_status()
+            if depth == 0:   # once per base path, not for every folder below it
+                logger.debug(f"Content-Encoding for {metric_path}: {response.headers.get('Content-Encoding', 'identity')}")
+            metrics = await response.json(content_type=None)
+        
+        # Keep leaf/folder order identical to the sync version
+        parts = []
+        folders = []
+        
+        for metric in metrics:
+            metric_name = metric.get('name', '')
+            metric_type = metric.get('type', '')
+            
+            full_path = f"{metric_path}|{metric_name}"
+            
+            if metric_type == 'leaf':
+                parts.append([full_path])
+            elif metric_type == 'folder' and depth < max_depth:
+                folders.append((len(parts), full_path))
+                parts.append([])
+        
+    except Exception as e:
+        logger.debug(f"Error discovering metrics at {metric_path}: {e}")
+        return []
+    
+    sub_results = await asyncio.gather(*(
+        discover_metrics_async(session, url, full_path, logger, depth + 1, max_depth)
+        for _, full_path in folders
+    ))
+    for (idx, _), sub_metrics in zip(folders, sub_results):
+        parts[idx] = sub_metrics
+    
+    return [path for part in parts for path in part]
+
 def test_single_config(fetcher, args, logger):
     """Test metrics collection for single app/tier/node"""
     
@@ -7,9 +7,117 @@ import argparse
 import json
 import sys
 from datetime import datetime
+from pathlib import Path
 from fetchers.kibana_fetcher import KibanaDataFetcher
 from utils.logger import setup_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+    # One parser reused for every call; each instance allocates its own scratch buffers
+    _SIMDJSON_PARSER = simdjson.Parser()
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+def _json_loads(raw):
+    """Parse JSON text/bytes with orjson when installed, stdlib json otherwise"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _json_len(raw):
+    """Count top-level items of a JSON array/object without building Python objects"""
+    if SIMDJSON_AVAILABLE:
+        if isinstance(raw, str):
+            raw = raw.encode()
+        return len(_SIMDJSON_PARSER.parse(raw))
+    return len(_json_loads(raw))
+
+def _json_parse_lazy(raw):
+    """Parse JSON into a simdjson proxy (values decoded on access) when installed, plain objects otherwise"""
+    if SIMDJSON_AVAILABLE:
+        if isinstance(raw, str):
+            raw = raw.encode()
+        # Dedicated parser: the returned proxy stays bound to it while the caller holds it
+        return simdjson.Parser().parse(raw)
+    return _json_loads(raw)
+
+_PREVIEW_ENCODER = json.JSONEncoder(indent=2)
+
+def _json_head(obj, max_lines=None, max_chars=None):
+    """Indented JSON prefix of obj; encoding stops once max_lines newlines or max_chars are produced"""
+    chunks = []
+    newlines = chars = 0
+    for chunk in _PREVIEW_ENCODER.iterencode(obj):
+        chunks.append(chunk)
+        newlines += chunk.count('\n')
+        chars += len(chunk)
+        if (max_lines and newlines >= max_lines) or (max_chars and chars >= max_chars):
+            break
+    text = ''.join(chunks)
+    return text[:max_chars] if max_chars else text
+
+def _json_write(obj, output_file):
+    """Write obj as indented JSON; orjson serializes straight to bytes when installed"""
+    if ORJSON_AVAILABLE:
+        Path(output_file).write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(output_file, 'w') as f:
+        json.dump(obj, f, indent=2)
+
+def _ndjson_write(docs, output_file):
+    """Write one compact JSON document per line (NDJSON)"""
+    if ORJSON_AVAILABLE:
+        Path(output_file).write_bytes(
+            b''.join(orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE) for doc in docs))
+        return
+    with open(output_file, 'w') as f:
+        f.writelines(json.dumps(doc) + '\n' for doc in docs)
+
+SAVED_OBJECT_TYPES = ('index-pattern', 'visualization', 'dashboard')
+# Filled once per Kibana URL. The --list-* actions run sequentially in main(): they share this one
+# multi-type _find, so running them on threads would not remove any request
+_saved_objects_cache = {}
+
+def _find_saved_objects(fetcher, obj_type):
+    """Return saved objects of one type; all SAVED_OBJECT_TYPES are fetched in a single _find call"""
+    if fetcher.kibana_url not in _saved_objects_cache:
+        _saved_objects_cache[fetcher.kibana_url] = _fetch_saved_objects(fetcher)
+    
+    return _saved_objects_cache[fetcher.kibana_url].get(obj_type, [])
+
+SAVED_OBJECTS_PER_PAGE = 1000
+
+def _fetch_saved_objects(fetcher):
+    """Multi-type _find over all SAVED_OBJECT_TYPES, paged until 'total' is read, bucketed by type"""
+    url = f"{fetcher.kibana_url}/api/saved_objects/_find"
+    buckets = {t: [] for t in SAVED_OBJECT_TYPES}
+    fetched = 0
+    page = 1
+    
+    while True:
+        params = [('type', t) for t in SAVED_OBJECT_TYPES] + [
+            ('per_page', SAVED_OBJECTS_PER_PAGE), ('page', page)]
+        response = fetcher.session.get(url, params=params, verify=False, timeout=30)
+        response.raise_for_status()
+        
+        data = _json_loads(response.content)
+        saved_objects = data.get('saved_objects', [])
+        for obj in saved_objects:
+            buckets.setdefault(obj.get('type'), []).append(obj)
+        fetched += len(saved_objects)
+        
+        # An empty page also ends the loop, in case 'total' overstates what the server will return
+        if not saved_objects or fetched >= data.get('total', 0):
+            return buckets
+        page += 1
+
 def main():
     parser = argparse.ArgumentParser(description='Test Kibana Data Collection')
     
@@ -42,6 +150,7 @@ def main():
     
     # Output
     parser.add_argument('--output', help='Output JSON file for discovered items')
+    parser.add_argument('--hits-output', help='Output NDJSON file for --test-index-search hit sources')
     parser.add_argument('--verbose', action='store_true', help='Verbose output')
     
     args = parser.parse_args()
@@ -100,7 +209,7 @@ def main():
     
     # Test index search
     if args.test_index_search:
-        test_index_search(fetcher, args.test_index_search, logger)
+        test_index_search(fetcher, args.test_index_search, logger, args.hits_output)
     
     # Test time series
     if args.test_timeseries:
@@ -148,18 +257,8 @@ def list_index_patterns(fetcher, logger, output_file=None):
     logger.info("LISTING INDEX PATTERNS")
     logger.info("=" * 80)
     
-    url = f"{fetcher.kibana_url}/api/saved_objects/_find"
-    params = {
-        'type': 'index-pattern',
-        'per_page': 100
-    }
-    
     try:
-        response = fetcher.session.get(url, params=params, verify=False, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
-        saved_objects = data.get('saved_objects', [])
+        saved_objects = _find_saved_objects(fetcher, 'index-pattern')
         
         logger.info(f"\nFound {len(saved_objects)} index patterns:")
         
@@ -171,14 +270,13 @@ def list_index_patterns(fetcher, logger, output_file=None):
             
             # Count fields
             try:
-                fields = json.loads(pattern_fields)
-                field_count = len(fields)
+                field_count = _json_len(pattern_fields)
             except:
                 field_count = 0
             
-            logger.info(f"\n[{idx}] {pattern_title}")
-            logger.info(f"    ID: {pattern_id}")
-            logger.info(f"    Fields: {field_count}")
+            logger.info("\n[%d] %s", idx, pattern_title)
+            logger.info("    ID: %s", pattern_id)
+            logger.info("    Fields: %s", field_count)
             
             patterns.append({
                 'id': pattern_id,
@@ -187,8 +285,7 @@ def list_index_patterns(fetcher, logger, output_file=None):
             })
         
         if output_file:
-            with open(output_file, 'w') as f:
-                json.dump({'index_patterns': patterns}, f, indent=2)
+            _json_write({'index_patterns': patterns}, output_file)
             logger.info(f"\n✓ Index patterns saved to: {output_file}")
         
         return patterns
@@ -203,18 +300,8 @@ def list_visualizations(fetcher, logger, output_file=None):
     logger.info("LISTING VISUALIZATIONS")
     logger.info("=" * 80)
     
-    url = f"{fetcher.kibana_url}/api/saved_objects/_find"
-    params = {
-        'type': 'visualization',
-        'per_page': 100
-    }
-    
     try:
-        response = fetcher.session.get(url, params=params, verify=False, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
-        saved_objects = data.get('saved_objects', [])
+        saved_objects = _find_saved_objects(fetcher, 'visualization')
         
         logger.info(f"\nFound {len(saved_objects)} visualizations:")
         
@@ -224,9 +311,9 @@ def list_visualizations(fetcher, logger, output_file=None):
             viz_title = obj.get('attributes', {}).get('title', 'Unknown')
             viz_type = obj.get('attributes', {}).get('type', 'Unknown')
             
-            logger.info(f"\n[{idx}] {viz_title}")
-            logger.info(f"    ID: {viz_id}")
-            logger.info(f"    Type: {viz_type}")
+            logger.info("\n[%d] %s", idx, viz_title)
+            logger.info("    ID: %s", viz_id)
+            logger.info("    Type: %s", viz_type)
             
             visualizations.append({
                 'id': viz_id,
@@ -235,8 +322,7 @@ def list_visualizations(fetcher, logger, output_file=None):
             })
         
         if output_file:
-            with open(output_file, 'w') as f:
-                json.dump({'visualizations': visualizations}, f, indent=2)
+            _json_write({'visualizations': visualizations}, output_file)
             logger.info(f"\n✓ Visualizations saved to: {output_file}")
         
         return visualizations
@@ -251,18 +337,8 @@ def list_dashboards(fetcher, logger, output_file=None):
     logger.info("LISTING DASHBOARDS")
     logger.info("=" * 80)
     
-    url = f"{fetcher.kibana_url}/api/saved_objects/_find"
-    params = {
-        'type': 'dashboard',
-        'per_page': 100
-    }
-    
     try:
-        response = fetcher.session.get(url, params=params, verify=False, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
-        saved_objects = data.get('saved_objects', [])
+        saved_objects = _find_saved_objects(fetcher, 'dashboard')
         
         logger.info(f"\nFound {len(saved_objects)} dashboards:")
         
@@ -274,14 +350,13 @@ def list_dashboards(fetcher, logger, output_file=None):
             # Get panel count
             panels_json = obj.get('attributes', {}).get('panelsJSON', '[]')
             try:
-                panels = json.loads(panels_json)
-                panel_count = len(panels)
+                panel_count = _json_len(panels_json)
             except:
                 panel_count = 0
             
-            logger.info(f"\n[{idx}] {dash_title}")
-            logger.info(f"    ID: {dash_id}")
-            logger.info(f"    Panels: {panel_count}")
+            logger.info("\n[%d] %s", idx, dash_title)
+            logger.info("    ID: %s", dash_id)
+            logger.info("    Panels: %s", panel_count)
             
             dashboards.append({
                 'id': dash_id,
@@ -290,8 +365,7 @@ def list_dashboards(fetcher, logger, output_file=None):
             })
         
         if output_file:
-            with open(output_file, 'w') as f:
-                json.dump({'dashboards': dashboards}, f, indent=2)
+            _json_write({'dashboards': dashboards}, output_file)
             logger.info(f"\n✓ Dashboards saved to: {output_file}")
         
         return dashboards
@@ -324,7 +398,7 @@ def test_visualization(fetcher, viz_id, logger):
         vis_state = attributes.get('visState')
         if vis_state:
             try:
-                state = json.loads(vis_state) if isinstance(vis_state, str) else vis_state
+                state = _json_parse_lazy(vis_state) if isinstance(vis_state, str) else vis_state
                 logger.info(f"\n  Visualization State:")
                 logger.info(f"    Type: {state.get('type', 'N/A')}")
                 logger.info(f"    Title: {state.get('title', 'N/A')}")
@@ -333,12 +407,12 @@ def test_visualization(fetcher, viz_id, logger):
         
         # Display raw data preview
         logger.info("\n  Raw Data Preview:")
-        preview = json.dumps(viz_data, indent=2)
-        lines = preview.split('\n')
+        # Encode just past line 20: a 21st line only tells us the preview is truncated
+        lines = _json_head(viz_data, max_lines=20).split('\n')
         for line in lines[:20]:
             logger.info(f"    {line}")
         if len(lines) > 20:
-            logger.info(f"    ... ({len(lines) - 20} more lines)")
+            logger.info("    ... (more lines)")
     else:
         logger.error("✗ Failed to fetch visualization")
 
@@ -360,10 +434,12 @@ def test_dashboard(fetcher, dash_id, logger):
         # Get panels
         panels_json = attributes.get('panelsJSON', '[]')
         try:
-            panels = json.loads(panels_json)
+            panels = _json_parse_lazy(panels_json)
             logger.info(f"Panels: {len(panels)}")
             
-            for idx, panel in enumerate(panels[:5], 1):
+            # Index instead of slicing so only the 5 shown panels are ever decoded
+            for idx in range(1, min(len(panels), 5) + 1):
+                panel = panels[idx - 1]
                 panel_type = panel.get('type', 'Unknown')
                 logger.info(f"\n  [{idx}] Panel Type: {panel_type}")
                 if 'id' in panel:
@@ -373,7 +449,7 @@ def test_dashboard(fetcher, dash_id, logger):
     else:
         logger.error("✗ Failed to fetch dashboard")
 
-def test_index_search(fetcher, index_name, logger):
+def test_index_search(fetcher, index_name, logger, output_file=None):
     """Test searching an index"""
     logger.info("\n" + "=" * 80)
     logger.info("TESTING INDEX SEARCH")
@@ -409,7 +485,11 @@ def test_index_search(fetcher, index_name, logger):
         if documents:
             logger.info("\nSample Document:")
             sample = documents[0].get('_source', {})
-            logger.info(json.dumps(sample, indent=2)[:500])
+            logger.info(_json_head(sample, max_chars=500))
+            
+            if output_file:
+                _ndjson_write((doc.get('_source', {}) for doc in documents), output_file)
+                logger.info(f"\n✓ {len(documents)} documents saved to: {output_file}")
     else:
         logger.error("✗ Search failed")
 
@@ -454,7 +534,7 @@ def test_timeseries(fetcher, index_name, metric_field, time_field, logger):
         else:
             logger.warning("No time buckets in aggregation result")
             logger.info(f"\nRaw aggregation result:")
-            logger.info(json.dumps(aggregations, indent=2)[:500])
+            logger.info(_json_head(aggregations, max_chars=500))
     else:
         logger.error("✗ Time series query failed")
 
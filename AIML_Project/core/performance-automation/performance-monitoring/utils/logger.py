@@ -1,9 +1,27 @@
 """
 Logging utility for monitoring
 """
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+# Shared by every handler instead of one Formatter per setup_logger call
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Loggers only push records onto the queue; a single background listener does the stdout/file writes
+_LOG_QUEUE = queue.SimpleQueue()
+_CONSOLE_HANDLER = logging.StreamHandler(sys.stdout)
+_CONSOLE_HANDLER.setFormatter(_FORMATTER)
+_LISTENER = QueueListener(_LOG_QUEUE, _CONSOLE_HANDLER, respect_handler_level=True)
+_LISTENER.start()
+# Drain pending records before the interpreter exits
+atexit.register(_LISTENER.stop)
 
 def setup_logger(name: str, log_file: str = None, level=logging.INFO):
     """Setup logger with console and file handlers"""
@@ -15,23 +33,16 @@ def setup_logger(name: str, log_file: str = None, level=logging.INFO):
     if logger.handlers:
         return logger
     
-    # Format
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    # Console output goes through the shared queue
+    logger.addHandler(QueueHandler(_LOG_QUEUE))
     
     # File handler
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(_FORMATTER)
+        # Only this logger's records (and its children's) go to its file
+        file_handler.addFilter(logging.Filter(name))
+        _LISTENER.handlers = _LISTENER.handlers + (file_handler,)
     
-    return logger
\ No newline at end of file
+    return logger